@@ -8,7 +8,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class DrivePrice:
     """Represents a hard drive price entry."""
 
@@ -64,17 +64,18 @@ def find_best_prices(drives: list[DrivePrice]) -> dict[int, DrivePrice]:
     return dict(sorted(best.items(), reverse=True))
 
 
-def find_best_overall(drives: list[DrivePrice]) -> Optional[DrivePrice]:
+def find_best_overall(drives: list[DrivePrice], best_prices: dict[int, DrivePrice]) -> Optional[DrivePrice]:
     """
-    Find the single best deal across all drives (lowest $/TB).
+    Find the single best deal (lowest $/TB) from the per-tier winners of find_best_prices.
+    The overall best is always the best of some capacity tier. When several
+    tiers tie on $/TB, the one that comes first in drives wins.
     """
-    best = None
-    for drive in drives:
-        if not drive.is_available or not drive.price_per_tb:
-            continue
-        if best is None or drive.price_per_tb < best.price_per_tb:
-            best = drive
-    return best
+    lowest = min((d.price_per_tb for d in best_prices.values()), default=None)
+    tied = [d for d in best_prices.values() if d.price_per_tb == lowest]
+    if len(tied) <= 1:
+        return tied[0] if tied else None
+    # Only a tie needs the input order
+    return next(d for d in drives if any(d is t for t in tied))
 
 
 def truncate_model(model: str, max_length: int = 45) -> str:
@@ -96,7 +97,7 @@ def generate_html(drives: list[DrivePrice], output_path: str = "index.html") ->
         The generated HTML string
     """
     best_prices = find_best_prices(drives)
-    best_overall = find_best_overall(drives)
+    best_overall = find_best_overall(drives, best_prices)
     timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
 
     # Generate best overall hero section
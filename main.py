@@ -3,10 +3,18 @@ Main entry point for the Shuck Stop price aggregator.
 Scrapes prices from multiple sources and generates a static HTML page.
 """
 
+import functools
 import logging
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import attrgetter
 from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from generate_html import DrivePrice
 
 # Set up logging
 logging.basicConfig(
@@ -16,6 +24,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Upper bound on scrapers fetching at the same time
+MAX_CONCURRENT_SCRAPES = 5
+
 # Major brands to include - only trusted shuckable drives
 ALLOWED_BRANDS = [
     # Seagate lines
@@ -51,6 +62,21 @@ EXCLUDED_KEYWORDS = [
 ]
 
 
+# One alternation per keyword list, so each list is a single scan of the model
+_ALLOWED_RE = re.compile("|".join(map(re.escape, ALLOWED_BRANDS)))
+_EXCLUDED_RE = re.compile("|".join(map(re.escape, EXCLUDED_KEYWORDS)))
+
+# Single-word keywords, for a cheap whole-token check before the substring scan
+_SINGLE_ALLOWED = frozenset(b for b in ALLOWED_BRANDS if " " not in b)
+_SINGLE_EXCLUDED = frozenset(k for k in EXCLUDED_KEYWORDS if " " not in k)
+
+
+class ScrapedDrive(Protocol):
+    """A scraper's DrivePrice, which lowercases its model once at construction."""
+
+    _model_lower: str
+
+
 def is_major_brand(model: str) -> bool:
     """
     Check if a drive model is from a major brand (Seagate or WD).
@@ -61,19 +87,31 @@ def is_major_brand(model: str) -> bool:
     Returns:
         True if the drive is from an allowed major brand
     """
-    model_lower = model.lower()
+    return _is_major_brand_lower(model.lower())
+
+
+def drive_is_major_brand(drive: ScrapedDrive) -> bool:
+    """is_major_brand for a scraped drive, reusing its precomputed lowercased model."""
+    return _is_major_brand_lower(drive._model_lower)
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_major_brand_lower(model_lower: str) -> bool:
+    """Brand check on an already-lowercased model string, memoized per model."""
+    tokens = frozenset(model_lower.split())
     
-    # First check exclusions
-    for excluded in EXCLUDED_KEYWORDS:
-        if excluded in model_lower:
-            return False
+    # A whole-token exclusion needs no further scanning
+    if tokens & _SINGLE_EXCLUDED:
+        return False
     
-    # Then check if it matches any allowed brand
-    for brand in ALLOWED_BRANDS:
-        if brand in model_lower:
-            return True
+    # Exclusions win over allowed brands
+    if _EXCLUDED_RE.search(model_lower):
+        return False
     
-    return False
+    if tokens & _SINGLE_ALLOWED:
+        return True
+    
+    return _ALLOWED_RE.search(model_lower) is not None
 
 
 def main():
@@ -82,65 +120,91 @@ def main():
     from scrape_diskprices import scrape_diskprices
     from scrape_shucks import scrape_shucks
 
-    all_drives: list[DrivePrice] = []
-
-    # Scrape shucks.top
-    logger.info("Scraping shucks.top...")
-    try:
-        shucks_drives = scrape_shucks()
-        logger.info(f"Found {len(shucks_drives)} drives from shucks.top")
-
-        # Convert to common DrivePrice format
-        for d in shucks_drives:
-            all_drives.append(
-                DrivePrice(
-                    capacity_tb=d.capacity_tb,
-                    model=d.model,
-                    source="shucks.top",
-                    retailer=d.retailer,
-                    price=d.price,
-                    url=d.url,
-                    price_per_tb=d.price_per_tb,
-                    is_available=d.is_available,
-                    lowest_ever=getattr(d, "lowest_ever", None),
-                    lowest_ever_date=getattr(d, "lowest_ever_date", None),
-                )
+    # Scraper per source; results are ingested in this order
+    scrapers = {
+        "shucks.top": scrape_shucks,
+        "diskprices.com": lambda: scrape_diskprices(min_capacity_tb=8),
+    }
+
+    # Scrape all sources concurrently - the fetches are independent network I/O
+    logger.info("Scraping %s...", ", ".join(scrapers))
+    with ThreadPoolExecutor(max_workers=min(len(scrapers), MAX_CONCURRENT_SCRAPES)) as executor:
+        futures = {executor.submit(scraper): source for source, scraper in scrapers.items()}
+        results = {}
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                results[source] = future.result()
+                logger.info("Found %d drives from %s", len(results[source]), source)
+            except Exception as e:
+                logger.error("Error scraping %s: %s", source, e)
+
+    # Single ingest pass: brand filter, dedup and summary stats together.
+    # Dedup keeps the lowest price for each capacity/model/retailer combo.
+    seen: dict[tuple[int, str, str], DrivePrice] = {}
+    sources: Counter[str] = Counter()
+    best: dict[int, DrivePrice] = {}
+    total = 0
+
+    for source in scrapers:
+        for r in results.get(source, []):
+            total += 1
+
+            # Filter for major brands only (cheapest rejection first)
+            if not drive_is_major_brand(r):
+                continue
+
+            # Convert to common DrivePrice format
+            d = DrivePrice(
+                capacity_tb=r.capacity_tb,
+                model=r.model,
+                source=source,
+                retailer=r.retailer,
+                price=r.price,
+                url=r.url,
+                price_per_tb=r.price_per_tb,
+                is_available=r.is_available,
+                lowest_ever=getattr(r, "lowest_ever", None),
+                lowest_ever_date=getattr(r, "lowest_ever_date", None),
             )
-    except Exception as e:
-        logger.error(f"Error scraping shucks.top: {e}")
-
-    # Scrape diskprices.com
-    logger.info("Scraping diskprices.com...")
-    try:
-        diskprices_drives = scrape_diskprices(min_capacity_tb=8)
-        logger.info(f"Found {len(diskprices_drives)} drives from diskprices.com")
-
-        # Convert to common DrivePrice format
-        for d in diskprices_drives:
-            all_drives.append(
-                DrivePrice(
-                    capacity_tb=d.capacity_tb,
-                    model=d.model,
-                    source="diskprices.com",
-                    retailer=d.retailer,
-                    price=d.price,
-                    url=d.url,
-                    price_per_tb=d.price_per_tb,
-                    is_available=d.is_available,
+
+            key = drive_key(d)
+            existing = seen.get(key)
+            if existing is not None:
+                # Replace only if lower price or current is unavailable
+                if not (d.price and d.is_available):
+                    continue
+                if existing.price and existing.is_available and d.price >= existing.price:
+                    continue
+                sources[existing.source] -= 1
+
+            seen[key] = d
+            sources[source] += 1
+
+            cap = key[0]
+            current = best.get(cap)
+            if existing is not None and current is not None and (
+                current is existing or d.price_per_tb == current.price_per_tb
+            ):
+                # d takes over the evicted entry's place in seen, so when that entry
+                # was the tier's best, or d ties with it, re-pick in seen order
+                winner = min(
+                    (x for x in seen.values() if int(x.capacity_tb) == cap and x.is_available and x.price_per_tb),
+                    key=attrgetter("price_per_tb"),
+                    default=None,
                 )
-            )
-    except Exception as e:
-        logger.error(f"Error scraping diskprices.com: {e}")
+                if winner is None:
+                    del best[cap]
+                else:
+                    best[cap] = winner
+            elif d.is_available and d.price_per_tb:
+                if current is None or d.price_per_tb < current.price_per_tb:
+                    best[cap] = d
 
-    # Filter for major brands only
-    logger.info(f"Total drives before brand filter: {len(all_drives)}")
-    all_drives = [d for d in all_drives if is_major_brand(d.model)]
-    logger.info(f"Total drives after brand filter (Seagate/WD only): {len(all_drives)}")
+    all_drives = list(seen.values())
 
-    # Deduplicate - prefer lower prices when same capacity/retailer
-    logger.info(f"Total drives before deduplication: {len(all_drives)}")
-    all_drives = deduplicate_drives(all_drives)
-    logger.info(f"Total drives after deduplication: {len(all_drives)}")
+    logger.info("Total drives before brand filter and deduplication: %d", total)
+    logger.info("Total drives after brand filter (Seagate/WD only) and deduplication: %d", len(all_drives))
 
     if not all_drives:
         logger.error("No drives found! Check if websites are accessible.")
@@ -151,57 +215,32 @@ def main():
     output_dir.mkdir(exist_ok=True)
     output_path = output_dir / "index.html"
 
-    logger.info(f"Generating HTML output to {output_path}")
+    logger.info("Generating HTML output to %s", output_path)
     generate_html(all_drives, str(output_path))
 
     logger.info("Done! Generated index.html")
 
     # Print summary
-    print("\n" + "=" * 60)
-    print("SCRAPING SUMMARY (Major Brands Only: Seagate & WD)")
-    print("=" * 60)
-
-    # Count by source
-    sources = {}
-    for d in all_drives:
-        sources[d.source] = sources.get(d.source, 0) + 1
-
-    for source, count in sources.items():
-        print(f"  {source}: {count} drives")
+    lines = [
+        "",
+        "=" * 60,
+        "SCRAPING SUMMARY (Major Brands Only: Seagate & WD)",
+        "=" * 60,
+    ]
+    lines.extend(f"  {source}: {count} drives" for source, count in sources.items() if count)
 
     # Best deals
-    print("\n" + "-" * 60)
-    print("BEST DEALS BY CAPACITY:")
-    print("-" * 60)
-
-    best = {}
-    for d in all_drives:
-        if d.is_available and d.price_per_tb:
-            cap = int(d.capacity_tb)
-            if cap not in best or d.price_per_tb < best[cap].price_per_tb:
-                best[cap] = d
-
-    for cap in sorted(best.keys()):
+    lines += ["", "-" * 60, "BEST DEALS BY CAPACITY:", "-" * 60]
+    for cap in sorted(best):
         d = best[cap]
-        print(f"  {cap}TB: ${d.price:.2f} (${d.price_per_tb:.2f}/TB) - {d.retailer} - {d.model[:40]}")
+        lines.append(f"  {cap}TB: ${d.price:.2f} (${d.price_per_tb:.2f}/TB) - {d.retailer} - {d.model[:40]}")
 
+    print("\n".join(lines))
 
-def deduplicate_drives(drives: list) -> list:
-    """
-    Remove duplicate drives, keeping the lowest price for each capacity/model/retailer combo.
-    """
-    seen = {}
-    for d in drives:
-        key = (int(d.capacity_tb), d.model.lower(), d.retailer.lower())
-        if key not in seen:
-            seen[key] = d
-        elif d.price and d.is_available:
-            # Keep if lower price or current is unavailable
-            existing = seen[key]
-            if not existing.price or not existing.is_available or d.price < existing.price:
-                seen[key] = d
 
-    return list(seen.values())
+def drive_key(d: "DrivePrice") -> tuple[int, str, str]:
+    """Dedup key for a drive: capacity tier, model and retailer, case-insensitive."""
+    return (int(d.capacity_tb), d.model.casefold(), d.retailer.casefold())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+"""
+Helpers shared by the scrapers.
+"""
+
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+import lxml.etree
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import requests_cache
+except ImportError:  # requests-cache is optional; fall back to an uncached session
+    requests_cache = None
+
+# On-disk HTTP cache used when requests-cache is installed (".sqlite" is appended)
+CACHE_PATH = Path(__file__).parent / "shuck_stop_http"
+
+# Read size when streaming responses into the incremental parser
+CHUNK_SIZE = 64 * 1024
+
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Return the session shared by all scrapers, creating it on first use.
+
+    Connections are kept alive and retried on transient 5xx errors. With
+    requests-cache installed, responses are also cached on disk and revalidated
+    with ETag/Last-Modified, so unchanged pages come back as a 304.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            if requests_cache is not None:
+                session = requests_cache.CachedSession(
+                    str(CACHE_PATH),
+                    backend="sqlite",
+                    expire_after=900,
+                    cache_control=True,
+                    stale_if_error=True,
+                )
+            else:
+                session = requests.Session()
+            session.mount(
+                "https://",
+                HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=4,
+                    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+                ),
+            )
+            _session = session
+        return _session
+
+
+def clean_text(el: lxml.html.HtmlElement) -> str:
+    """Text content of an element with runs of whitespace (including newlines) collapsed."""
+    return " ".join(el.text_content().split())
+
+
+def iter_rows(response: requests.Response) -> Iterator[lxml.html.HtmlElement]:
+    """
+    Incrementally parse a streamed HTML response, yielding each <tr> as it closes.
+
+    Rows are cleared once the caller has moved on, so the tree never holds more
+    than the row currently being processed.
+    """
+    parser = lxml.etree.HTMLPullParser(events=("end",), tag="tr")
+    parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+
+    def drain():
+        for _, row in parser.read_events():
+            yield row
+            row.clear(keep_tail=True)
+            parent = row.getparent()
+            while row.getprevious() is not None:
+                del parent[0]
+
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
@@ -3,14 +3,35 @@ Scraper for diskprices.com - Aggregated disk prices from Amazon.
 """
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
-import requests
-from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
 
+from scrape_common import clean_text, get_session, iter_rows
 
-@dataclass
+# Only the columns the scraper reads (2, 3, 5, 6, 7, 8 by index; see the table
+# layout in scrape_diskprices), so unused cells are never materialized
+_ROW_CELLS = lxml.etree.XPath(
+    "./td[position()=3 or position()=4 or position()=6 or position()=7 or position()=8 or position()=9]"
+)
+
+# Amazon product/affiliate URLs start with one of these (compared lowercased,
+# since hosts are case-insensitive)
+_AMAZON_PREFIXES = ("https://www.amazon.", "https://amzn.to/", "http://www.amazon.", "https://amazon.")
+_AMAZON_PREFIX_LEN = max(map(len, _AMAZON_PREFIXES))
+
+_CAP_TB = re.compile(r"([\d.]+)\s*TB", re.IGNORECASE)
+_CAP_GB = re.compile(r"([\d.]+)\s*GB", re.IGNORECASE)
+_PRICE = re.compile(r"\$?([\d]+\.?\d*)")
+_TB_STRIP = re.compile(r"\d+\s*TB")
+# Price and TB capacity in one match over "<price>\x00<capacity>"; equivalent
+# to _PRICE followed by _CAP_TB, used to parse both cells of a row at once
+_PRICE_CAPACITY = re.compile(r"\D*?\$?(\d+\.?\d*)[^\x00]*\x00[^\x00]*?([\d.]+)\s*TB", re.IGNORECASE)
+
+
+@dataclass(slots=True)
 class DrivePrice:
     """Represents a hard drive price entry."""
 
@@ -24,10 +45,13 @@ class DrivePrice:
     is_available: bool = True
     condition: str = "New"
     disk_type: str = "External HDD"
+    # Lowercased model, computed once for brand filtering
+    _model_lower: str = field(default="", init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.price and self.capacity_tb:
             self.price_per_tb = round(self.price / self.capacity_tb, 2)
+        self._model_lower = self.model.lower()
 
 
 def parse_capacity(capacity_str: str) -> Optional[float]:
@@ -36,13 +60,17 @@ def parse_capacity(capacity_str: str) -> Optional[float]:
         return None
     # Handle TB with optional multiplier (e.g., "12 TB x20" means 20 units of 12TB)
     # For our purposes, we want the single unit capacity
-    match = re.search(r"([\d.]+)\s*TB", capacity_str, re.IGNORECASE)
-    if match:
-        return float(match.group(1))
-    # Handle GB (convert to TB)
-    match = re.search(r"([\d.]+)\s*GB", capacity_str, re.IGNORECASE)
-    if match:
-        return float(match.group(1)) / 1000
+    try:
+        match = _CAP_TB.search(capacity_str)
+        if match:
+            return float(match.group(1))
+        # Handle GB (convert to TB)
+        match = _CAP_GB.search(capacity_str)
+        if match:
+            return float(match.group(1)) / 1000
+    except ValueError:
+        # [\d.]+ can match strings like "." or "1.2.3"
+        return None
     return None
 
 
@@ -52,12 +80,104 @@ def parse_price(price_str: str) -> Optional[float]:
         return None
     # Remove commas and find the number after $
     cleaned = price_str.replace(",", "")
-    match = re.search(r"\$?([\d]+\.?\d*)", cleaned)
+    match = _PRICE.search(cleaned)
     if match:
         return float(match.group(1))
     return None
 
 
+def parse_price_capacity(price_str: str, capacity_str: str) -> tuple[Optional[float], Optional[float]]:
+    """
+    Parse a row's price and capacity cells with a single regex match.
+
+    Falls back to parse_price/parse_capacity for anything the combined pattern
+    doesn't cover (missing price, GB capacities, malformed numbers).
+    """
+    match = _PRICE_CAPACITY.match(f"{price_str.replace(',', '')}\x00{capacity_str}")
+    if match:
+        try:
+            return float(match.group(1)), float(match.group(2))
+        except ValueError:
+            pass
+    return parse_price(price_str), parse_capacity(capacity_str)
+
+
+def _parse_row(
+    row: lxml.html.HtmlElement,
+    min_capacity_tb: float,
+    *,
+    _row_cells=_ROW_CELLS,
+    _prefixes=_AMAZON_PREFIXES,
+    _prefix_len=_AMAZON_PREFIX_LEN,
+    _clean_text=clean_text,
+    _parse_price_capacity=parse_price_capacity,
+    _tb_strip=_TB_STRIP,
+    _DrivePrice=DrivePrice,
+) -> Optional[DrivePrice]:
+    """
+    Parse one diskprices.com table row into a DrivePrice, or None if it doesn't qualify.
+
+    The keyword-only defaults bind module globals as locals, since this runs once
+    per row; callers should not pass them.
+    """
+    cells = _row_cells(row)
+    if len(cells) < 6:  # Row has fewer than 9 columns
+        return None
+
+    # Extract data by column position
+    price_cell, capacity_cell, type_cell, subtype_cell, condition_cell, product_cell = cells
+    price_str = _clean_text(price_cell)
+    capacity_str = _clean_text(capacity_cell)
+    disk_type_str = _clean_text(type_cell)
+    subtype_str = _clean_text(subtype_cell)
+    condition_str = _clean_text(condition_cell)
+
+    # Get product name and link from last cell
+    link = product_cell.find(".//a")
+    if link is None:
+        return None
+
+    model = _clean_text(link)
+    href = link.get("href") or ""
+
+    # Only process Amazon links; lowercase just the prefix, not the whole URL
+    if not href[:_prefix_len].lower().startswith(_prefixes):
+        return None
+
+    # Parse values
+    price, capacity = _parse_price_capacity(price_str, capacity_str)
+    if not capacity or capacity < min_capacity_tb:
+        return None
+
+    if not price or price < 10:  # Skip unreasonably low prices
+        return None
+
+    # Skip non-HDD items (SSDs, tape drives, etc.)
+    if "SSD" in subtype_str.upper() or "TAPE" in disk_type_str.upper():
+        return None
+
+    # Only include external HDDs
+    if "External" not in disk_type_str:
+        return None
+
+    # Clean up model name - remove capacity from it
+    model_clean = _tb_strip.sub("", model).strip()
+    if not model_clean or len(model_clean) < 3:
+        model_clean = "External HDD"
+
+    return _DrivePrice(
+        capacity_tb=capacity,
+        model=model_clean[:100],  # Truncate long names
+        source="diskprices.com",
+        retailer="Amazon",
+        price=price,
+        url=href,
+        is_available=True,
+        condition=condition_str,
+        disk_type=f"{disk_type_str} {subtype_str}".strip(),
+    )
+
+
 def scrape_diskprices(min_capacity_tb: int = 8) -> list[DrivePrice]:
     """
     Scrape hard drive prices from diskprices.com.
@@ -73,15 +193,12 @@ def scrape_diskprices(min_capacity_tb: int = 8) -> list[DrivePrice]:
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
+        "Accept-Encoding": "gzip, deflate",
     }
 
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.content, "lxml")
     drives = []
 
-    # Find the main data table
+    # Rows are parsed as they stream in rather than after the full download
     # diskprices.com table structure (by column index):
     # 0: Hidden sort value
     # 1: Price per TB (e.g., $10.38)
@@ -93,76 +210,13 @@ def scrape_diskprices(min_capacity_tb: int = 8) -> list[DrivePrice]:
     # 7: Condition (e.g., New)
     # 8: Product name with Amazon link
 
-    tables = soup.find_all("table")
-
-    for table in tables:
-        rows = table.find_all("tr")
-
-        for row in rows:
-            cells = row.find_all("td")
-            if len(cells) < 9:
-                continue
-
-            try:
-                # Extract data by column position
-                price_per_tb_str = cells[1].get_text(strip=True)
-                price_str = cells[2].get_text(strip=True)
-                capacity_str = cells[3].get_text(strip=True)
-                disk_type_str = cells[5].get_text(strip=True)
-                subtype_str = cells[6].get_text(strip=True)
-                condition_str = cells[7].get_text(strip=True)
-
-                # Get product name and link from last cell
-                product_cell = cells[8]
-                link = product_cell.find("a")
-                if not link:
-                    continue
-
-                model = link.get_text(strip=True)
-                href = link.get("href", "")
-
-                # Only process Amazon links
-                if "amazon" not in href.lower():
-                    continue
-
-                # Parse values
-                capacity = parse_capacity(capacity_str)
-                if not capacity or capacity < min_capacity_tb:
-                    continue
-
-                price = parse_price(price_str)
-                if not price or price < 10:  # Skip unreasonably low prices
-                    continue
-
-                # Skip non-HDD items (SSDs, tape drives, etc.)
-                if "SSD" in subtype_str.upper() or "TAPE" in disk_type_str.upper():
-                    continue
-
-                # Only include external HDDs
-                if "External" not in disk_type_str:
-                    continue
-
-                # Clean up model name - remove capacity from it
-                model_clean = re.sub(r"\d+\s*TB", "", model).strip()
-                if not model_clean or len(model_clean) < 3:
-                    model_clean = "External HDD"
-
-                drive = DrivePrice(
-                    capacity_tb=capacity,
-                    model=model_clean[:100],  # Truncate long names
-                    source="diskprices.com",
-                    retailer="Amazon",
-                    price=price,
-                    url=href,
-                    is_available=True,
-                    condition=condition_str,
-                    disk_type=f"{disk_type_str} {subtype_str}".strip(),
-                )
-                drives.append(drive)
+    with get_session().get(url, headers=headers, stream=True, timeout=30) as response:
+        response.raise_for_status()
 
-            except (IndexError, ValueError, AttributeError):
-                # Skip malformed rows
-                continue
+        for row in iter_rows(response):
+            drive = _parse_row(row, min_capacity_tb)
+            if drive is not None:
+                drives.append(drive)
 
     # Remove duplicates based on URL
     seen_urls = set()
@@ -3,14 +3,18 @@ Scraper for shucks.top - WD external drive price tracker.
 """
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
-import requests
-from bs4 import BeautifulSoup
+import lxml.html
 
+from scrape_common import clean_text, get_session, iter_rows
 
-@dataclass
+_PRICE_S = re.compile(r"\$?([\d,]+\.?\d*)")
+_CAP_S = re.compile(r"(\d+)\s*TB")
+
+
+@dataclass(slots=True)
 class DrivePrice:
     """Represents a hard drive price entry."""
 
@@ -24,58 +28,34 @@ class DrivePrice:
     is_available: bool = True
     lowest_ever: Optional[float] = None
     lowest_ever_date: Optional[str] = None
+    # Lowercased model, computed once for brand filtering
+    _model_lower: str = field(default="", init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.price and self.capacity_tb:
             self.price_per_tb = round(self.price / self.capacity_tb, 2)
+        self._model_lower = self.model.lower()
 
 
 def parse_price(price_str: str) -> Optional[float]:
     """Extract numeric price from string like '$234.99'."""
     if not price_str or price_str == "—":
         return None
-    match = re.search(r"\$?([\d,]+\.?\d*)", price_str.replace(",", ""))
+    match = _PRICE_S.search(price_str.replace(",", ""))
     if match:
         return float(match.group(1))
     return None
 
 
-def scrape_shucks() -> list[DrivePrice]:
-    """
-    Scrape hard drive prices from shucks.top.
-
-    Returns:
-        List of DrivePrice objects with current prices from various retailers.
-    """
-    url = "https://shucks.top/"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-    }
-
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
-
-    soup = BeautifulSoup(response.content, "lxml")
-    drives = []
-
-    # Find the main data table
-    table = soup.find("table")
-    if not table:
-        return drives
-
-    # Get header info to map columns to retailers
-    thead = table.find("thead")
-    if not thead:
-        return drives
-
-    header_row = thead.find("tr")
+def _parse_header_row(header_row: lxml.html.HtmlElement) -> list[str]:
+    """Map each header column to a retailer key (or its lowercased text)."""
     headers = []
-    for th in header_row.find_all("th"):
+    for th in header_row.findall("th"):
         # Check for retailer SVG icons or text
-        svg = th.find("svg")
-        if svg:
+        svg = th.find(".//svg")
+        if svg is not None:
             # Try to identify retailer from SVG path or title
-            path_data = str(svg)
+            path_data = lxml.html.tostring(svg, encoding="unicode")
             if "amazon" in path_data.lower() or "f90" in path_data:  # Amazon orange
                 headers.append("amazon")
             elif "bestbuy" in path_data.lower() or "ffed31" in path_data:  # Best Buy yellow
@@ -89,14 +69,25 @@ def scrape_shucks() -> list[DrivePrice]:
             else:
                 headers.append("unknown")
         else:
-            text = th.get_text(strip=True).lower()
+            text = clean_text(th).lower()
             headers.append(text if text else "unknown")
+    return headers
 
-    # Parse table body
-    tbody = table.find("tbody")
-    if not tbody:
-        return drives
 
+def scrape_shucks() -> list[DrivePrice]:
+    """
+    Scrape hard drive prices from shucks.top.
+
+    Returns:
+        List of DrivePrice objects with current prices from various retailers.
+    """
+    url = "https://shucks.top/"
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+        "Accept-Encoding": "gzip, deflate",
+    }
+
+    drives = []
     retailer_map = {
         "amazon": "Amazon",
         "bestbuy": "Best Buy",
@@ -105,75 +96,90 @@ def scrape_shucks() -> list[DrivePrice]:
         "newegg": "Newegg",
     }
 
-    for row in tbody.find_all("tr"):
-        cells = row.find_all("td")
-        if len(cells) < 2:
-            continue
-
-        # Extract capacity
-        capacity_text = cells[0].get_text(strip=True)
-        capacity_match = re.search(r"(\d+)\s*TB", capacity_text)
-        if not capacity_match:
-            continue
-        capacity_tb = int(capacity_match.group(1))
-
-        # Extract model
-        model = cells[1].get_text(strip=True)
-
-        # Extract lowest ever price if available
-        lowest_ever = None
-        lowest_ever_date = None
-        if len(cells) >= 8:
-            lowest_cell = cells[7]
-            lowest_price_elem = lowest_cell.find("p")
-            if lowest_price_elem:
-                lowest_ever = parse_price(lowest_price_elem.get_text(strip=True))
-            date_elem = lowest_cell.find("p", class_="ago")
-            if date_elem:
-                lowest_ever_date = date_elem.get_text(strip=True)
-
-        # Process retailer columns (columns 2-6 typically)
-        for idx, cell in enumerate(cells[2:7], start=2):
-            if idx >= len(headers):
-                continue
+    # Rows are parsed as they stream in. The first <thead> row fixes the
+    # column-to-retailer mapping; only <tbody> rows of that same table follow.
+    table = None
+    retailers_by_idx = None
 
-            retailer_key = headers[idx]
-            if retailer_key not in retailer_map:
-                continue
+    with get_session().get(url, headers=headers, stream=True, timeout=30) as response:
+        response.raise_for_status()
 
-            retailer = retailer_map[retailer_key]
-
-            # Check if this cell has a price link
-            link = cell.find("a")
-            if not link:
+        for row in iter_rows(response):
+            section = row.getparent()
+            if retailers_by_idx is None:
+                if section.tag == "thead":
+                    table = section.getparent()
+                    retailers_by_idx = [retailer_map.get(key) for key in _parse_header_row(row)]
                 continue
-
-            link_text = link.get_text(strip=True)
-            href = link.get("href", "")
-
-            # Skip "check" links (no price) and unavailable items
-            if link_text.lower() == "check":
+            if section.tag != "tbody" or section.getparent() is not table:
                 continue
 
-            price = parse_price(link_text)
-            if not price:
+            cells = row.findall("td")
+            if len(cells) < 2:
                 continue
 
-            # Check availability - look for 'oos' class
-            is_available = "oos" not in cell.get("class", [])
-
-            drive = DrivePrice(
-                capacity_tb=capacity_tb,
-                model=model,
-                source="shucks.top",
-                retailer=retailer,
-                price=price,
-                url=href,
-                is_available=is_available,
-                lowest_ever=lowest_ever,
-                lowest_ever_date=lowest_ever_date,
-            )
-            drives.append(drive)
+            # Extract capacity
+            capacity_text = clean_text(cells[0])
+            capacity_match = _CAP_S.search(capacity_text)
+            if not capacity_match:
+                continue
+            capacity_tb = int(capacity_match.group(1))
+
+            # Extract model
+            model = clean_text(cells[1])
+
+            # Extract lowest ever price if available
+            lowest_ever = None
+            lowest_ever_date = None
+            if len(cells) >= 8:
+                lowest_cell = cells[7]
+                lowest_price_elem = lowest_cell.find(".//p")
+                if lowest_price_elem is not None:
+                    lowest_ever = parse_price(clean_text(lowest_price_elem))
+                date_elems = [p for p in lowest_cell.find_class("ago") if p.tag == "p"]
+                if date_elems:
+                    lowest_ever_date = clean_text(date_elems[0])
+
+            # Process retailer columns (columns 2-6 typically)
+            for idx, cell in enumerate(cells[2:7], start=2):
+                if idx >= len(retailers_by_idx):
+                    continue
+
+                retailer = retailers_by_idx[idx]
+                if retailer is None:
+                    continue
+
+                # Check if this cell has a price link
+                link = cell.find(".//a")
+                if link is None:
+                    continue
+
+                link_text = clean_text(link)
+                href = link.get("href", "")
+
+                # Skip "check" links (no price) and unavailable items
+                if link_text.lower() == "check":
+                    continue
+
+                price = parse_price(link_text)
+                if not price:
+                    continue
+
+                # Check availability - look for 'oos' class
+                is_available = "oos" not in (cell.get("class") or "").split()
+
+                drive = DrivePrice(
+                    capacity_tb=capacity_tb,
+                    model=model,
+                    source="shucks.top",
+                    retailer=retailer,
+                    price=price,
+                    url=href,
+                    is_available=is_available,
+                    lowest_ever=lowest_ever,
+                    lowest_ever_date=lowest_ever_date,
+                )
+                drives.append(drive)
 
     return drives
 